@@ -235,12 +235,18 @@ export class ThreeJsCannonEsSceneRigger {
 				o.userData.threejscannones_type = TypeAsString[o.userData.threejscannones_type as keyof typeof TypeAsString];
 			}
 
-            if ("threejscannones_cgroup" in o.userData || "threejscannones_cgroup_array" in o.userData) {
-                o.userData.threejscannones_cgroup = arrayToBitmask(o.userData.threejscannones_cgroup, o.userData.threejscannones_cgroup_array);
+            // newer exports store the packed mask directly (signed int32 in the GLB,
+            // so >>> 0 brings bit 31 back); old files carry a 32-int array
+            if ("threejscannones_cgroup" in o.userData || "threejscannones_cgroup_array" in o.userData || "threejscannones_cgroup_mask" in o.userData) {
+                o.userData.threejscannones_cgroup = o.userData.threejscannones_cgroup_mask !== undefined
+                    ? o.userData.threejscannones_cgroup_mask >>> 0
+                    : arrayToBitmask(o.userData.threejscannones_cgroup, o.userData.threejscannones_cgroup_array);
             }
 
-            if ("threejscannones_cwith" in o.userData || "threejscannones_cwith_array" in o.userData) {
-                o.userData.threejscannones_cwith = arrayToBitmask(o.userData.threejscannones_cwith, o.userData.threejscannones_cwith_array);
+            if ("threejscannones_cwith" in o.userData || "threejscannones_cwith_array" in o.userData || "threejscannones_cwith_mask" in o.userData) {
+                o.userData.threejscannones_cwith = o.userData.threejscannones_cwith_mask !== undefined
+                    ? o.userData.threejscannones_cwith_mask >>> 0
+                    : arrayToBitmask(o.userData.threejscannones_cwith, o.userData.threejscannones_cwith_array);
             }
 
 
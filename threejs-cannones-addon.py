@@ -32,10 +32,131 @@ bl_info = {
 
 import bpy
 import gpu
+import numpy as np
+from bpy.app.handlers import persistent
 from gpu_extras.batch import batch_for_shader
+from mathutils import Vector
+
+# Flip on to get console chatter from the add-on's lifecycle
+DEBUG = False
+
+draw_handler = None
+
+# Shared shader for the debug lines (creating one per redraw is wasteful)
+_line_shader = None
+
+# Cached line batches: obj pointer -> (signature, start, endpoints, batch)
+# where signature is the tuple of target pointers (None when unset) and
+# endpoints holds (target pointer, end) per line. All of an object's debug
+# lines live in one batch; entries survive until an endpoint moves.
+_line_cache = {}
+
+# Objects (pointers) whose transform changed since the last redraw
+_dirty = set()
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    for update in depsgraph.updates:
+        if update.is_updated_transform and isinstance(update.id, bpy.types.Object):
+            _dirty.add(update.id.original.as_pointer())
+
+@persistent
+def _on_frame_change(scene, depsgraph):
+    # depsgraph_update_post doesn't fire on frame changes, so animated or
+    # keyframed endpoints would freeze during playback/scrubbing — just drop
+    # the whole (tiny) cache and let the next redraw rebuild it
+    _line_cache.clear()
+
+# msgbus owner tokens, one per rigged object, so its target subscriptions
+# can be dropped together with clear_by_owner
+_msgbus_owners = {}
+
+_LINE_TARGET_PROPS = ("threejscannones_A", "threejscannones_B", "threejscannones_syncSource")
+
+def _mark_dirty(ptr):
+    _dirty.add(ptr)
+
+def _refresh_target_subscriptions(self, context):
+    """(Re)subscribe to the location of every object this one draws a line to.
+
+    Runs as the update callback of the A/B/syncSource pointer props; direct
+    RNA writes to a target's location then invalidate the cached line even
+    when they don't round-trip through the depsgraph handler.
+    """
+    # The retained batch references the old target set — drop it now rather
+    # than waiting for the per-frame signature check.
+    _line_cache.pop(self.as_pointer(), None)
+
+    owner = _msgbus_owners.setdefault(self.as_pointer(), object())
+    bpy.msgbus.clear_by_owner(owner)
+    for prop in _LINE_TARGET_PROPS:
+        target = getattr(self, prop, None)
+        if target and target != self:
+            bpy.msgbus.subscribe_rna(
+                key=target.path_resolve("location", False),
+                owner=owner,
+                args=(target.as_pointer(),),
+                notify=_mark_dirty,
+            )
+
+def _clear_target_subscriptions():
+    for owner in _msgbus_owners.values():
+        bpy.msgbus.clear_by_owner(owner)
+    _msgbus_owners.clear()
+
+def _evict_dirty_lines():
+    if not _dirty:
+        return
+    stale = [key for key, entry in _line_cache.items()
+             if key in _dirty or not _dirty.isdisjoint(entry[0])]
+    for key in stale:
+        del _line_cache[key]
+    _dirty.clear()
+
+# Dash pattern (in world units) for the debug lines
+DASH_LENGTH = 0.25
+DASH_GAP = 0.15
+
+# The dashing happens in the fragment shader: each line is just 2 vertices
+# carrying their arc length, and fragments inside a gap are discarded.
+# Color is a vertex attribute so every line fits in one batch.
+_DASH_VERT_SRC = """
+uniform mat4 ModelViewProjectionMatrix;
+
+in vec3 pos;
+in float arclen;
+in vec4 color;
+out float v_arclen;
+out vec4 v_color;
+
+void main()
+{
+    v_arclen = arclen;
+    v_color = color;
+    gl_Position = ModelViewProjectionMatrix * vec4(pos, 1.0);
+}
+"""
+
+_DASH_FRAG_SRC = """
+uniform float dash_length;
+uniform float dash_gap;
+
+in float v_arclen;
+in vec4 v_color;
+out vec4 fragColor;
 
-if 'draw_handler' not in globals():
-    draw_handler = None
+void main()
+{
+    if (mod(v_arclen, dash_length + dash_gap) > dash_length) discard;
+    fragColor = v_color;
+}
+"""
+
+def _get_line_shader():
+    global _line_shader
+    if _line_shader is None:
+        _line_shader = gpu.types.GPUShader(_DASH_VERT_SRC, _DASH_FRAG_SRC)
+    return _line_shader
 
 def create_sync_callback(prop_name, func=None):
     """Factory function that creates a callback for a specific property"""
@@ -49,122 +170,221 @@ def create_sync_callback(prop_name, func=None):
     
     return callback
 
+# Objects with a pending type-change cleanup, keyed by pointer so rapid
+# re-fires overwrite instead of stacking.
+_pending_type_change = {}
+
+TYPE_CHANGE_DEBOUNCE = 0.1  # seconds
+
+_MASK_DEFAULT = (True,) + (False,) * 31
+
+# Reset value for each physics property, known statically; avoids probing
+# each value's type with isinstance chains on every type change.
+_CLEAR_ACTIONS = {
+    "threejscannones_A": None,
+    "threejscannones_B": None,
+    "threejscannones_mass": 0.0,
+    "threejscannones_cgroup": _MASK_DEFAULT,
+    "threejscannones_cwith": _MASK_DEFAULT,
+    "threejscannones_customId": "",
+}
+
+# ID-prop-only mirrors (written by the vec->array sync) — just deleted
+_CLEAR_ID_PROPS = (
+    "threejscannones_cgroup_mask",
+    "threejscannones_cwith_mask",
+    # legacy 32-int array mirrors from older files
+    "threejscannones_cgroup_array",
+    "threejscannones_cwith_array",
+)
+
 def on_type_change(self, context):
-    obj = context.object
-    value = self.threejscannones_type  # current type 
+    # self IS the Object whose type changed — context.object may be a
+    # different (merely active) object during scripted batch edits
+    obj = self
+
+    # Debounce: rapid toggling (keyboard arrows, scripted edits) schedules
+    # the cleanup once and the timer applies it with the latest value.
+    schedule = not _pending_type_change
+    _pending_type_change[obj.as_pointer()] = obj
+    if schedule:
+        bpy.app.timers.register(_flush_type_changes, first_interval=TYPE_CHANGE_DEBOUNCE)
+
+def _flush_type_changes():
+    while _pending_type_change:
+        _, obj = _pending_type_change.popitem()
+        try:
+            _apply_type_change(obj)
+        except ReferenceError:
+            pass  # object was removed while the timer was pending
+        except Exception as ex:
+            # e.g. linked/library data is read-only — skip it and keep
+            # draining, or the dict never empties and no timer re-arms.
+            # Always surface it: the user's cleanup silently not happening
+            # is not a debug-only event.
+            print("⚠️  type-change cleanup failed:", repr(ex))
+    return None
+
+def _apply_type_change(obj):
+    value = obj.threejscannones_type  # current type
 
     # === Cleanup based on type ===
+    # All threejscannones_* props are registered by this module, so there is
+    # no need to probe for them with hasattr (slow on RNA structs).
 
     # Remove sync source if not 'sync'
     if value != 'sync':
-        if hasattr(obj, "threejscannones_syncSource"):
-            obj.threejscannones_syncSource = None
-            del self["threejscannones_syncSource"]
+        obj.threejscannones_syncSource = None
+        del obj["threejscannones_syncSource"]
 
     # If 'x', clear physics-related props
     if value == 'x':
-        props_to_clear = [
-            "threejscannones_A",
-            "threejscannones_B",
-            "threejscannones_mass",
-            "threejscannones_cgroup",
-            "threejscannones_cgroup_array",
-            "threejscannones_cwith",
-            "threejscannones_cwith_array",
-            "threejscannones_customId"
-        ]
-        for prop in props_to_clear: 
-            if prop in self:
-                del self[prop]
-            if hasattr(obj, prop):
-                # Clear based on type
-                attr = getattr(obj, prop)
-                if prop.endswith("_cgroup") or prop.endswith("_cwith"):
-                    default = [True] + [False] * (len(attr) - 1)
-                    setattr(obj, prop, default)
-                elif isinstance(attr, bpy.types.Object):
-                    setattr(obj, prop, None)
-                elif isinstance(attr, str):
-                    setattr(obj, prop, "")
-                elif isinstance(attr, (int, float)):
-                    setattr(obj, prop, 0)
-                elif isinstance(attr, bool):
-                    setattr(obj, prop, False)
-            
+        for prop, default in _CLEAR_ACTIONS.items():
+            if prop in obj:
+                del obj[prop]
+            setattr(obj, prop, default)
+        for prop in _CLEAR_ID_PROPS:
+            if prop in obj:
+                del obj[prop]
 
     # If 'sync', clear A and B
     elif value == 'sync':
-        if hasattr(obj, "threejscannones_A"):
-            obj.threejscannones_A = None
-            del self["threejscannones_A"]
-        if hasattr(obj, "threejscannones_B"):
-            obj.threejscannones_B = None
-            del self["threejscannones_B"]
+        obj.threejscannones_A = None
+        del obj["threejscannones_A"]
+        obj.threejscannones_B = None
+        del obj["threejscannones_B"]
 
     # For shape types: ensure cgroup and cwith are initialized
     elif value in {'box', 'sphere', 'compound', 'tube', 'custom'}:
-        if hasattr(obj, "threejscannones_cgroup") and not obj.threejscannones_cgroup:
+        if not obj.threejscannones_cgroup:
             obj.threejscannones_cgroup = True
-            del self["threejscannones_cgroup"]
-        if hasattr(obj, "threejscannones_cwith") and not obj.threejscannones_cwith:
+            del obj["threejscannones_cgroup"]
+        if not obj.threejscannones_cwith:
             obj.threejscannones_cwith = True
-            del self["threejscannones_cwith"]
+            del obj["threejscannones_cwith"]
+
+def _segment_outside_frustum(persp, start, end):
+    """True when the whole segment lies outside one view-frustum plane."""
+    a = persp @ Vector((start[0], start[1], start[2], 1.0))
+    b = persp @ Vector((end[0], end[1], end[2], 1.0))
+    for axis in range(3):
+        if a[axis] > a.w and b[axis] > b.w:
+            return True
+        if a[axis] < -a.w and b[axis] < -b.w:
+            return True
+    return False
+
+# Only these types reference other objects, so only they get debug lines
+_DEBUG_TYPES = frozenset({'hinge', 'point', 'dist', 'lock', 'tube', 'custom', 'sync'})
+
+# Line colors per pointer prop, in draw order
+_LINE_COLORS = (
+    ("threejscannones_A", (1.0, 0.0, 0.0, 0.8)),           # Red
+    ("threejscannones_B", (0.0, 0.0, 1.0, 0.8)),           # Blue
+    ("threejscannones_syncSource", (1.0, 1.0, 0.0, 0.8)),  # Yellow
+)
+
+def _build_line_batch(obj, targets):
+    """Pack every debug line of obj into a single LINES batch.
+
+    Color rides along as a vertex attribute, so A/B/syncSource all draw
+    with one shader bind and one draw call.
+    """
+    start = obj.matrix_world.translation.to_tuple()
+    pos = []
+    arclen = []
+    colors = []
+    endpoints = []
+    for (_, color), target in zip(_LINE_COLORS, targets):
+        if target is None:
+            continue
+        end = target.matrix_world.translation.to_tuple()
+        length = (Vector(end) - Vector(start)).length
+        pos += [start, end]
+        arclen += [0.0, length]
+        colors += [color, color]
+        endpoints.append((target.as_pointer(), end))
+    if not pos:
+        return None
+    batch = batch_for_shader(_get_line_shader(), 'LINES', {
+        "pos": np.array(pos, dtype=np.float32),
+        "arclen": np.array(arclen, dtype=np.float32),
+        "color": np.array(colors, dtype=np.float32),
+    })
+    return start, tuple(endpoints), batch
+
+def draw_line_to_target():
+    obj = bpy.context.active_object
 
-def draw_line_to(obj, toPropName, color=(0.0, 1.0, 0.0, 0.8)):
+    if not obj:
+        return
+
+    # Common case: a non-rig or shape-only object — one enum read and out
+    if getattr(obj, "threejscannones_type", 'x') not in _DEBUG_TYPES:
+        return
+
+    # A rig type with no targets assigned yet — still nothing to draw
+    if not (obj.threejscannones_A or obj.threejscannones_B or obj.threejscannones_syncSource):
+        return
 
     if not bpy.context.space_data.overlay.show_overlays:
         return  # All overlays are off — respect that
 
-    # === Check if debug lines are enabled ===
+    # === Check if debug lines are enabled (once, not per line) ===
     if not getattr(bpy.context.scene, "show_debug_lines", True):
-        return 
+        return
 
-    # === Validate object and property ===
-    if not obj or not hasattr(obj, toPropName):
+    region = bpy.context.region
+    region_data = bpy.context.region_data
+    if region is None or region_data is None:
         return
+    if region.width < 64:
+        return  # collapsed / thumbnail-sized viewport, not worth drawing
 
-    target = getattr(obj, toPropName, None)
-    if not target or target == obj:
-        return  # No valid target
+    persp = region_data.perspective_matrix
 
-    # === Get world-space positions ===
-    start = obj.matrix_world.translation
-    end = target.matrix_world.translation
+    # Drop cached lines whose endpoints moved since the last redraw
+    _evict_dirty_lines()
 
-    # === Create line batch ===
-    coords = [start, end]
-    shader = gpu.shader.from_builtin('UNIFORM_COLOR')
-    batch = batch_for_shader(shader, 'LINES', {"pos": coords})
+    targets = tuple(
+        target if (target := getattr(obj, prop, None)) and target != obj else None
+        for prop, _ in _LINE_COLORS
+    )
+    signature = tuple(t.as_pointer() if t is not None else None for t in targets)
+
+    key = obj.as_pointer()
+    cached = _line_cache.get(key)
+    if cached is None or cached[0] != signature:
+        built = _build_line_batch(obj, targets)
+        if built is None:
+            _line_cache.pop(key, None)
+            return
+        cached = (signature,) + built
+        _line_cache[key] = cached
+    _, start, endpoints, batch = cached
+
+    if not endpoints:
+        return
+
+    # === Early-out when every line is off-screen ===
+    if all(_segment_outside_frustum(persp, start, end) for _, end in endpoints):
+        return
 
     # === Draw settings ===
     gpu.state.blend_set('ALPHA')
     gpu.state.line_width_set(2.0)
 
+    shader = _get_line_shader()
     shader.bind()
-    shader.uniform_float("color", color)
+    shader.uniform_float("ModelViewProjectionMatrix", persp)
+    shader.uniform_float("dash_length", DASH_LENGTH)
+    shader.uniform_float("dash_gap", DASH_GAP)
     batch.draw(shader)
 
     # === Restore state ===
     gpu.state.blend_set('NONE')
     gpu.state.line_width_set(1.0)
 
-def draw_line_to_target():
-    obj = bpy.context.active_object
-    
-    if not obj:
-        return  
-
-    # Draw multiple lines with different colors
-    draw_line_to(obj, "threejscannones_A", (1.0, 0.0, 0.0, 0.8))      # Red
-    draw_line_to(obj, "threejscannones_B", (0.0, 0.0, 1.0, 0.8))      # Blue
-    draw_line_to(obj, "threejscannones_syncSource", (1.0, 1.0, 0.0, 0.8))  # Yellow
-
-bpy.types.Scene.show_debug_lines = bpy.props.BoolProperty(
-    name=".debugLine Lines",
-    description="Show debug lines to A, B, and Sync Source targets",
-    default=True 
-)
-
 def draw_debug_lines_overlay(self, context):
     layout = self.layout
     scene = context.scene
@@ -180,90 +400,136 @@ def draw_debug_lines_overlay(self, context):
 def remove_debug_lines_overlay():
     bpy.types.VIEW3D_PT_overlay.remove(draw_debug_lines_overlay)
 
-bpy.types.Object.threejscannones_layers = bpy.props.EnumProperty(
-    name="Collision Group",
-    description="Select collision layers",
-    items=[
-        ('1', "1", ""),
-        ('2', "2", ""),
-        ('4', "3", ""),
-        ('8', "4", ""),
-        ('16', "5", ""),
-        ('32', "6", ""),
-        ('64', "7", ""),
-        ('128', "8", ""),
-        ('256', "9", ""),
-        ('512', "10", ""),
-    ]
-)  
-
-def make_update_vec_to_array(prop_name, key_name):
+def make_update_vec_to_mask(prop_name, key_name, legacy_key):
     def _update(self, context):
-        self[key_name] = [1 if v else 0 for v in getattr(self, prop_name)]
+        mask = 0
+        for i, v in enumerate(getattr(self, prop_name)):
+            if v:
+                mask |= 1 << i
+        # ID-property ints are signed 32-bit, so group 32 (bit 31) only fits
+        # as its two's-complement value; the loader normalizes with >>> 0
+        self[key_name] = mask - 0x1_0000_0000 if mask & 0x8000_0000 else mask
+        if legacy_key in self:
+            del self[legacy_key]  # pre-mask files stored a 32-int array
     return _update
 
-bpy.types.Object.threejscannones_cgroup = bpy.props.BoolVectorProperty(
-    name="I'm in group(s)...", 
-    description="Groups in which this collider is in...",
-    size=32,
-    subtype='LAYER_MEMBER',  
-    default=(True,) + (False,) * 31,
-    update=make_update_vec_to_array(
-        "threejscannones_cgroup",
-        "threejscannones_cgroup_array"
-    ),
-)
+def register_properties():
+    bpy.types.Scene.show_debug_lines = bpy.props.BoolProperty(
+        name=".debugLine Lines",
+        description="Show debug lines to A, B, and Sync Source targets",
+        default=True
+    )
 
-bpy.types.Object.threejscannones_customId = bpy.props.StringProperty(name="Custom ID", update=create_sync_callback("threejscannones_customId")) 
-
-bpy.types.Object.threejscannones_cwith = bpy.props.BoolVectorProperty(
-    name="I collide with group(s)...",
-    description="Groups that collide with us...",
-    size=32,
-    subtype='LAYER_MEMBER',  
-    default=(True,) + (False,) * 31,
-	update=make_update_vec_to_array(
-        "threejscannones_cwith",
-        "threejscannones_cwith_array"
-    ),
-) 
-
-bpy.types.Object.threejscannones_mass = bpy.props.FloatProperty(name="Mass", update=create_sync_callback("threejscannones_mass")) 
-
-bpy.types.Object.threejscannones_A = bpy.props.PointerProperty(
-    name="A",
-    type=bpy.types.Object, 
-	update=create_sync_callback("threejscannones_A")
-)
-bpy.types.Object.threejscannones_B = bpy.props.PointerProperty(
-    name="B",
-    type=bpy.types.Object, 
-	update=create_sync_callback("threejscannones_B")
-) 
-bpy.types.Object.threejscannones_syncSource = bpy.props.PointerProperty(
-    name="Collider",
-    type=bpy.types.Object, 
-	update=create_sync_callback("threejscannones_syncSource")
-) 
-bpy.types.Object.threejscannones_type = bpy.props.EnumProperty(
-    name="Type",
-    items=[ 
-        ('x', "---", ""),
-        ('box', "Box Collider", ""),
-        ('sphere', "Sphere Collider", ""),
-        ('compound',"Compound shape (from child boxes)","Children are boxes, combines them into one single body/collider."),
-        ('lock',"Glue/Lock colliders","Glue two objects so they act like glued togheder."),
-        ('hinge',"Hinge Constrain (on local Z axis)","Constrain that will hinge on the object's local z axis"),
-        ('point',"Point Constrain","Connects 2 colliders via this point" ),
-        ('dist',"Keep this distance", "Keeps the same distance between two bodies as they have right now"),
-        ('sync', "Sync position & rotation", "this ThreeJs object will copy the position and rotation of the cannon's collider."),
-        ('tube',"Tube / Cable", "Creates a cable from A to B. Must have 2 emoty childs, one representing the head, and the other the tail."),
-        ('custom',"Custom Constraint", "Define your own custom constrain"),
-		('trimesh',"TriMesh (mesh collider)","Mesh collider, will use the object's mesh to create a collider.")
-    ],
-    update=create_sync_callback("threejscannones_type", on_type_change)
+    bpy.types.Object.threejscannones_layers = bpy.props.EnumProperty(
+        name="Collision Group",
+        description="Select collision layers",
+        items=[
+            ('1', "1", ""),
+            ('2', "2", ""),
+            ('4', "3", ""),
+            ('8', "4", ""),
+            ('16', "5", ""),
+            ('32', "6", ""),
+            ('64', "7", ""),
+            ('128', "8", ""),
+            ('256', "9", ""),
+            ('512', "10", ""),
+        ]
+    )  
+
+    bpy.types.Object.threejscannones_cgroup = bpy.props.BoolVectorProperty(
+        name="I'm in group(s)...", 
+        description="Groups in which this collider is in...",
+        size=32,
+        subtype='LAYER_MEMBER',  
+        default=(True,) + (False,) * 31,
+        update=make_update_vec_to_mask(
+            "threejscannones_cgroup",
+            "threejscannones_cgroup_mask",
+            "threejscannones_cgroup_array"
+        ),
+    )
+
+    bpy.types.Object.threejscannones_customId = bpy.props.StringProperty(name="Custom ID", update=create_sync_callback("threejscannones_customId")) 
+
+    bpy.types.Object.threejscannones_cwith = bpy.props.BoolVectorProperty(
+        name="I collide with group(s)...",
+        description="Groups that collide with us...",
+        size=32,
+        subtype='LAYER_MEMBER',  
+        default=(True,) + (False,) * 31,
+    update=make_update_vec_to_mask(
+            "threejscannones_cwith",
+            "threejscannones_cwith_mask",
+            "threejscannones_cwith_array"
+        ),
+    ) 
+
+    bpy.types.Object.threejscannones_mass = bpy.props.FloatProperty(name="Mass", update=create_sync_callback("threejscannones_mass")) 
+
+    bpy.types.Object.threejscannones_A = bpy.props.PointerProperty(
+        name="A",
+        type=bpy.types.Object, 
+    update=create_sync_callback("threejscannones_A", _refresh_target_subscriptions)
+    )
+    bpy.types.Object.threejscannones_B = bpy.props.PointerProperty(
+        name="B",
+        type=bpy.types.Object, 
+    update=create_sync_callback("threejscannones_B", _refresh_target_subscriptions)
+    ) 
+    bpy.types.Object.threejscannones_syncSource = bpy.props.PointerProperty(
+        name="Collider",
+        type=bpy.types.Object, 
+    update=create_sync_callback("threejscannones_syncSource", _refresh_target_subscriptions)
+    ) 
+    bpy.types.Object.threejscannones_type = bpy.props.EnumProperty(
+        name="Type",
+        items=[ 
+            ('x', "---", ""),
+            ('box', "Box Collider", ""),
+            ('sphere', "Sphere Collider", ""),
+            ('compound',"Compound shape (from child boxes)","Children are boxes, combines them into one single body/collider."),
+            ('lock',"Glue/Lock colliders","Glue two objects so they act like glued togheder."),
+            ('hinge',"Hinge Constrain (on local Z axis)","Constrain that will hinge on the object's local z axis"),
+            ('point',"Point Constrain","Connects 2 colliders via this point" ),
+            ('dist',"Keep this distance", "Keeps the same distance between two bodies as they have right now"),
+            ('sync', "Sync position & rotation", "this ThreeJs object will copy the position and rotation of the cannon's collider."),
+            ('tube',"Tube / Cable", "Creates a cable from A to B. Must have 2 emoty childs, one representing the head, and the other the tail."),
+            ('custom',"Custom Constraint", "Define your own custom constrain"),
+        ('trimesh',"TriMesh (mesh collider)","Mesh collider, will use the object's mesh to create a collider.")
+        ],
+        update=create_sync_callback("threejscannones_type", on_type_change)
+    )
+
+_OBJECT_PROPS = (
+    "threejscannones_layers",
+    "threejscannones_cgroup",
+    "threejscannones_customId",
+    "threejscannones_cwith",
+    "threejscannones_mass",
+    "threejscannones_A",
+    "threejscannones_B",
+    "threejscannones_syncSource",
+    "threejscannones_type",
 )
 
+def unregister_properties():
+    for name in _OBJECT_PROPS:
+        try:
+            delattr(bpy.types.Object, name)
+        except AttributeError:
+            pass  # already gone (e.g. partial reload)
+    try:
+        del bpy.types.Scene.show_debug_lines
+    except AttributeError:
+        pass
+
+# Type categories deciding which props the panel exposes — frozensets give
+# O(1) membership checks on every properties-editor repaint.
+_MASS_TYPES = frozenset({'box', 'sphere', 'compound', 'trimesh'})
+_AB_TYPES = frozenset({'hinge', 'point', 'dist', 'lock', 'tube', 'custom'})
+_GROUP_TYPES = frozenset({'box', 'sphere', 'compound', 'tube', 'custom', 'trimesh'})
+
 class ThreeJsCannonEsRigger(bpy.types.Panel):
     bl_label = "ThreeJs / Cannon-es (Physics)"
     bl_idname = "OBJECT_PT_my_object_panel"
@@ -272,49 +538,68 @@ class ThreeJsCannonEsRigger(bpy.types.Panel):
     bl_context = "object"
 
     def draw(self, context):
-        layout = self.layout 
+        layout = self.layout
         obj = context.object
-        layout.prop(context.object, "threejscannones_type") 
+        layout.prop(obj, "threejscannones_type")
 
         layout.operator("wm.url_open", text="Open Docs (git repo)", icon='HELP').url = bl_info["doc_url"]
 
-        if context.object.threejscannones_type == 'custom':
-            layout.prop(context.object, "threejscannones_customId")  
-        
-        match context.object.threejscannones_type: 
-            case 'box' | 'sphere' | 'compound' | 'trimesh':
-                layout.prop(context.object, "threejscannones_mass")  
-            case 'hinge' | 'point' | 'dist' | 'lock' | 'tube' | 'custom': 
-                row = layout.row()
-                layout.prop(context.object, "threejscannones_A")
-                layout.prop(context.object, "threejscannones_B") 
-            case 'sync':
-                layout.prop(obj,"threejscannones_syncSource")
-                
-        match context.object.threejscannones_type:  
-            case 'box' | 'sphere' | 'compound' | 'tube' | 'custom' | 'trimesh':   
-                layout.prop(context.object,"threejscannones_cgroup" )  
-                layout.prop(context.object,"threejscannones_cwith" )
+        # Read the enum once and branch on set membership
+        t = obj.threejscannones_type
+
+        if t == 'custom':
+            layout.prop(obj, "threejscannones_customId")
+
+        if t in _MASS_TYPES:
+            layout.prop(obj, "threejscannones_mass")
+        elif t in _AB_TYPES:
+            layout.prop(obj, "threejscannones_A")
+            layout.prop(obj, "threejscannones_B")
+        elif t == 'sync':
+            layout.prop(obj, "threejscannones_syncSource")
+
+        if t in _GROUP_TYPES:
+            layout.prop(obj, "threejscannones_cgroup")
+            layout.prop(obj, "threejscannones_cwith")
 
 def register():
     global draw_handler
+    register_properties()
     bpy.utils.register_class(ThreeJsCannonEsRigger)
     draw_handler = bpy.types.SpaceView3D.draw_handler_add(
         draw_line_to_target, (), 'WINDOW', 'POST_VIEW'
     )
     bpy.types.VIEW3D_PT_overlay.append(draw_debug_lines_overlay)
+    if _on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+    if _on_frame_change not in bpy.app.handlers.frame_change_post:
+        bpy.app.handlers.frame_change_post.append(_on_frame_change)
 
 def unregister():
     global draw_handler
     bpy.utils.unregister_class(ThreeJsCannonEsRigger)
     remove_debug_lines_overlay()
+    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+    if _on_frame_change in bpy.app.handlers.frame_change_post:
+        bpy.app.handlers.frame_change_post.remove(_on_frame_change)
+    # A pending debounce timer must not fire after the props are gone
+    if bpy.app.timers.is_registered(_flush_type_changes):
+        bpy.app.timers.unregister(_flush_type_changes)
+    _pending_type_change.clear()
+    _clear_target_subscriptions()
+    _line_cache.clear()
+    _dirty.clear()
+    unregister_properties()
     # Remove draw handler if it exists
     if draw_handler is not None:
         try:
             bpy.types.SpaceView3D.draw_handler_remove(draw_handler, 'WINDOW')
-            print("🧹 Removed old draw handler")
+            if DEBUG:
+                print("🧹 Removed old draw handler")
         except (AttributeError, KeyError, TypeError):
-            print("⚠️  Draw handler was already removed")
+            if DEBUG:
+                print("⚠️  Draw handler was already removed")
         draw_handler = None 
 
 if __name__ == "__main__":